@@ -1,53 +1,94 @@
 """
 API routes for flashcard management.
+
+Service errors are turned into HTTP responses by the exception handlers
+registered in main.py: FlashcardNotFound -> 404, other ValueErrors -> 422.
 """
 
 import logging
+from functools import lru_cache
+from pathlib import Path
 from typing import List
-from fastapi import APIRouter, HTTPException, Depends, status
-from pydantic import BaseModel, Field
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
 
 from ..models.flashcard import Flashcard
-from ..services.flashcard_service import FlashcardService
-from ..storage.file_storage import FileStorageService
+from ..services.flashcard_service import FlashcardNotFound, FlashcardService
+from ..storage.factory import create_storage_service
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/flashcards", tags=["flashcards"])
 
+# List responses larger than this are streamed instead of encoded in one go
+STREAM_THRESHOLD = 1000
+# Number of flashcards encoded per streamed chunk
+STREAM_CHUNK_SIZE = 200
+
 
 # Request/Response Models
 
+
 class FlashcardCreateRequest(BaseModel):
     """Request model for creating a flashcard."""
-    front: str = Field(..., min_length=1, max_length=500, description="Front content (question/prompt)")
-    back: str = Field(..., min_length=1, max_length=500, description="Back content (answer/translation)")
 
-    class Config:
-        schema_extra = {
-            "example": {
-                "front": "Hello",
-                "back": "Hola"
-            }
-        }
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        json_schema_extra={"example": {"front": "Hello", "back": "Hola"}},
+    )
+
+    front: str = Field(
+        ..., min_length=1, max_length=500, description="Front content (question/prompt)"
+    )
+    back: str = Field(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="Back content (answer/translation)",
+    )
 
 
 class FlashcardUpdateRequest(BaseModel):
     """Request model for updating a flashcard."""
-    front: str = Field(None, min_length=1, max_length=500, description="New front content")
-    back: str = Field(None, min_length=1, max_length=500, description="New back content")
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        str_strip_whitespace=True,
+        json_schema_extra={"example": {"front": "Hello there", "back": "Hola ahí"}},
+    )
+
+    front: str = Field(
+        None, min_length=1, max_length=500, description="New front content"
+    )
+    back: str = Field(
+        None, min_length=1, max_length=500, description="New back content"
+    )
+
+
+class FlashcardBulkCreateRequest(BaseModel):
+    """Request model for creating several flashcards at once."""
+
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
-                "front": "Hello there",
-                "back": "Hola ahí"
+                "items": [
+                    {"front": "Hello", "back": "Hola"},
+                    {"front": "Goodbye", "back": "Adiós"},
+                ]
             }
         }
+    )
+
+    items: List[FlashcardCreateRequest] = Field(
+        ..., min_length=1, max_length=1000, description="Flashcards to create"
+    )
 
 
 class FlashcardResponse(BaseModel):
     """Response model for flashcard data."""
+
     id: str
     front: str
     back: str
@@ -59,24 +100,23 @@ class FlashcardResponse(BaseModel):
     @classmethod
     def from_flashcard(cls, flashcard: Flashcard) -> "FlashcardResponse":
         """Convert a Flashcard model to response format."""
-        return cls(
+        # The flashcard is already validated, so skip re-running validation
+        return cls.model_construct(
             id=flashcard.id,
             front=flashcard.front,
             back=flashcard.back,
-            created_at=flashcard.created_at.isoformat(),
-            updated_at=flashcard.updated_at.isoformat(),
+            created_at=flashcard.created_at_iso,
+            updated_at=flashcard.updated_at_iso,
             study_count=flashcard.study_count,
-            correct_count=flashcard.correct_count
+            correct_count=flashcard.correct_count,
         )
 
 
 class FlashcardListResponse(BaseModel):
     """Response model for flashcard lists."""
-    flashcards: List[FlashcardResponse]
-    total_count: int
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "flashcards": [
                     {
@@ -86,151 +126,197 @@ class FlashcardListResponse(BaseModel):
                         "created_at": "2025-10-22T10:00:00Z",
                         "updated_at": "2025-10-22T10:00:00Z",
                         "study_count": 0,
-                        "correct_count": 0
+                        "correct_count": 0,
                     }
                 ],
-                "total_count": 1
+                "total_count": 1,
             }
         }
+    )
+
+    flashcards: List[FlashcardResponse]
+    total_count: int
+
+
+def _flashcard_payload(flashcard: Flashcard) -> dict:
+    """Build the plain-dict form of a flashcard for orjson list responses."""
+    return {
+        "id": flashcard.id,
+        "front": flashcard.front,
+        "back": flashcard.back,
+        "created_at": flashcard.created_at,
+        "updated_at": flashcard.updated_at,
+        "study_count": flashcard.study_count,
+        "correct_count": flashcard.correct_count,
+    }
+
+
+async def _iter_flashcard_list_json(flashcards: List[Flashcard]):
+    """Yield a FlashcardListResponse-shaped JSON document chunk by chunk."""
+    yield b'{"flashcards":['
+    for start in range(0, len(flashcards), STREAM_CHUNK_SIZE):
+        chunk = b",".join(
+            orjson.dumps(_flashcard_payload(fc))
+            for fc in flashcards[start : start + STREAM_CHUNK_SIZE]
+        )
+        yield chunk if start == 0 else b"," + chunk
+    yield b'],"total_count":' + str(len(flashcards)).encode() + b"}"
+
+
+def _flashcard_list_response(
+    flashcards: List[Flashcard], status_code: int = status.HTTP_200_OK
+):
+    """
+    Build a flashcard list response.
+
+    Large lists are streamed so the encoded document never has to be held
+    in memory at once, and the client can start reading early.
+    """
+    if len(flashcards) > STREAM_THRESHOLD:
+        return StreamingResponse(
+            _iter_flashcard_list_json(flashcards),
+            status_code=status_code,
+            media_type="application/json",
+        )
+
+    items = [_flashcard_payload(fc) for fc in flashcards]
+    return ORJSONResponse(
+        {"flashcards": items, "total_count": len(items)}, status_code=status_code
+    )
 
 
 # Dependency injection
 
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+
+
+@lru_cache(maxsize=1)
 def get_flashcard_service() -> FlashcardService:
-    """Get flashcard service instance."""
+    """Get the process-wide flashcard service instance."""
     # In production, this would use proper DI container
-    # For now, create service with default storage
-    from pathlib import Path
-    data_dir = Path(__file__).parent.parent.parent / "data"
-    storage = FileStorageService(str(data_dir))
+    # For now, build the service once per worker and reuse it for every request
+    storage = create_storage_service(str(DATA_DIR))
     return FlashcardService(storage)
 
 
 # API Endpoints
 
-@router.post("/", 
-             response_model=FlashcardResponse, 
-             status_code=status.HTTP_201_CREATED,
-             summary="Create a new flashcard",
-             description="Create a new flashcard with front and back content.")
+
+@router.post(
+    "/",
+    response_model=FlashcardResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create a new flashcard",
+    description="Create a new flashcard with front and back content.",
+)
 async def create_flashcard(
     request: FlashcardCreateRequest,
-    service: FlashcardService = Depends(get_flashcard_service)
+    service: FlashcardService = Depends(get_flashcard_service),
 ) -> FlashcardResponse:
     """
     Create a new flashcard.
-    
+
     - **front**: The question or prompt text (required, 1-500 chars)
     - **back**: The answer or translation text (required, 1-500 chars)
-    
+
     Returns the created flashcard with ID and timestamps.
     """
-    try:
-        flashcard = service.create_flashcard(request.front, request.back)
-        logger.info(f"API: Created flashcard {flashcard.id}")
-        return FlashcardResponse.from_flashcard(flashcard)
-    except ValueError as e:
-        logger.warning(f"API: Validation error creating flashcard: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=str(e)
-        )
-    except Exception as e:
-        logger.error(f"API: Error creating flashcard: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error while creating flashcard"
-        )
+    flashcard = await service.create_flashcard(request.front, request.back)
+    logger.info("API: Created flashcard %s", flashcard.id)
+    return FlashcardResponse.from_flashcard(flashcard)
+
+
+@router.post(
+    "/bulk",
+    response_model=FlashcardListResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create several flashcards",
+    description="Create a batch of flashcards with a single storage write.",
+)
+async def bulk_create_flashcards(
+    request: FlashcardBulkCreateRequest,
+    service: FlashcardService = Depends(get_flashcard_service),
+):
+    """
+    Create several flashcards at once.
+
+    - **items**: List of flashcards, each with front and back content (1-1000 items)
+
+    The batch is validated as a whole; if any item is invalid nothing is created.
+    Returns the created flashcards.
+    """
+    flashcards = await service.bulk_create_flashcards(
+        [(item.front, item.back) for item in request.items]
+    )
+
+    logger.info("API: Created %s flashcards in bulk", len(flashcards))
+    return _flashcard_list_response(flashcards, status_code=status.HTTP_201_CREATED)
 
 
-@router.get("/",
-            response_model=FlashcardListResponse,
-            summary="Get all flashcards",
-            description="Retrieve all flashcards in the collection.")
+@router.get(
+    "/",
+    response_model=FlashcardListResponse,
+    summary="Get all flashcards",
+    description="Retrieve all flashcards in the collection.",
+)
 async def get_all_flashcards(
-    service: FlashcardService = Depends(get_flashcard_service)
-) -> FlashcardListResponse:
+    service: FlashcardService = Depends(get_flashcard_service),
+):
     """
     Get all flashcards in the collection.
-    
+
     Returns a list of all flashcards with their details.
     """
-    try:
-        flashcards = service.get_all_flashcards()
-        flashcard_responses = [
-            FlashcardResponse.from_flashcard(fc) for fc in flashcards
-        ]
-        
-        logger.info(f"API: Retrieved {len(flashcards)} flashcards")
-        return FlashcardListResponse(
-            flashcards=flashcard_responses,
-            total_count=len(flashcards)
-        )
-    except Exception as e:
-        logger.error(f"API: Error retrieving flashcards: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error while retrieving flashcards"
-        )
+    flashcards = await service.get_all_flashcards()
 
+    logger.info("API: Retrieved %s flashcards", len(flashcards))
+    # Serialize plain dicts with orjson instead of validating a
+    # FlashcardResponse per card
+    return _flashcard_list_response(flashcards)
 
-@router.get("/{flashcard_id}",
-            response_model=FlashcardResponse,
-            summary="Get a specific flashcard",
-            description="Retrieve a single flashcard by its ID.")
+
+@router.get(
+    "/{flashcard_id}",
+    response_model=FlashcardResponse,
+    summary="Get a specific flashcard",
+    description="Retrieve a single flashcard by its ID.",
+)
 async def get_flashcard(
-    flashcard_id: str,
-    service: FlashcardService = Depends(get_flashcard_service)
+    flashcard_id: str, service: FlashcardService = Depends(get_flashcard_service)
 ) -> FlashcardResponse:
     """
     Get a specific flashcard by ID.
-    
+
     - **flashcard_id**: The unique identifier of the flashcard
-    
+
     Returns the flashcard details if found.
     """
-    try:
-        flashcard = service.get_flashcard(flashcard_id)
-        if not flashcard:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Flashcard {flashcard_id} not found"
-            )
-        
-        logger.info(f"API: Retrieved flashcard {flashcard_id}")
-        return FlashcardResponse.from_flashcard(flashcard)
-    except HTTPException:
-        raise
-    except ValueError as e:
-        logger.warning(f"API: Validation error getting flashcard {flashcard_id}: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=str(e)
-        )
-    except Exception as e:
-        logger.error(f"API: Error getting flashcard {flashcard_id}: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error while retrieving flashcard"
-        )
+    flashcard = await service.get_flashcard(flashcard_id)
+    if not flashcard:
+        raise FlashcardNotFound(flashcard_id)
+
+    logger.info("API: Retrieved flashcard %s", flashcard_id)
+    return FlashcardResponse.from_flashcard(flashcard)
 
 
-@router.put("/{flashcard_id}",
-            response_model=FlashcardResponse,
-            summary="Update a flashcard",
-            description="Update the content of an existing flashcard.")
+@router.put(
+    "/{flashcard_id}",
+    response_model=FlashcardResponse,
+    summary="Update a flashcard",
+    description="Update the content of an existing flashcard.",
+)
 async def update_flashcard(
     flashcard_id: str,
     request: FlashcardUpdateRequest,
-    service: FlashcardService = Depends(get_flashcard_service)
+    service: FlashcardService = Depends(get_flashcard_service),
 ) -> FlashcardResponse:
     """
     Update an existing flashcard.
-    
+
     - **flashcard_id**: The unique identifier of the flashcard
     - **front**: New front content (optional, 1-500 chars)
     - **back**: New back content (optional, 1-500 chars)
-    
+
     At least one field (front or back) must be provided.
     Returns the updated flashcard.
     """
@@ -238,103 +324,57 @@ async def update_flashcard(
     if request.front is None and request.back is None:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="At least one field (front or back) must be provided for update"
-        )
-    
-    try:
-        flashcard = service.update_flashcard(flashcard_id, request.front, request.back)
-        logger.info(f"API: Updated flashcard {flashcard_id}")
-        return FlashcardResponse.from_flashcard(flashcard)
-    except ValueError as e:
-        if "not found" in str(e):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=str(e)
-            )
-        else:
-            logger.warning(f"API: Validation error updating flashcard {flashcard_id}: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail=str(e)
-            )
-    except Exception as e:
-        logger.error(f"API: Error updating flashcard {flashcard_id}: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error while updating flashcard"
+            detail="At least one field (front or back) must be provided for update",
         )
 
+    flashcard = await service.update_flashcard(
+        flashcard_id, request.front, request.back
+    )
+    logger.info("API: Updated flashcard %s", flashcard_id)
+    return FlashcardResponse.from_flashcard(flashcard)
+
 
-@router.delete("/{flashcard_id}",
-               status_code=status.HTTP_204_NO_CONTENT,
-               summary="Delete a flashcard",
-               description="Delete a flashcard from the collection.")
+@router.delete(
+    "/{flashcard_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete a flashcard",
+    description="Delete a flashcard from the collection.",
+)
 async def delete_flashcard(
-    flashcard_id: str,
-    service: FlashcardService = Depends(get_flashcard_service)
+    flashcard_id: str, service: FlashcardService = Depends(get_flashcard_service)
 ):
     """
     Delete a flashcard by ID.
-    
+
     - **flashcard_id**: The unique identifier of the flashcard
-    
+
     Returns 204 No Content if successful, 404 if not found.
     """
-    try:
-        deleted = service.delete_flashcard(flashcard_id)
-        if not deleted:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Flashcard {flashcard_id} not found"
-            )
-        
-        logger.info(f"API: Deleted flashcard {flashcard_id}")
-        return None  # 204 No Content
-    except HTTPException:
-        raise
-    except ValueError as e:
-        logger.warning(f"API: Validation error deleting flashcard {flashcard_id}: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=str(e)
-        )
-    except Exception as e:
-        logger.error(f"API: Error deleting flashcard {flashcard_id}: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error while deleting flashcard"
-        )
+    deleted = await service.delete_flashcard(flashcard_id)
+    if not deleted:
+        raise FlashcardNotFound(flashcard_id)
 
+    logger.info("API: Deleted flashcard %s", flashcard_id)
+    return None  # 204 No Content
 
-@router.get("/search/{query}",
-            response_model=FlashcardListResponse,
-            summary="Search flashcards",
-            description="Search for flashcards by content.")
+
+@router.get(
+    "/search/{query}",
+    response_model=FlashcardListResponse,
+    summary="Search flashcards",
+    description="Search for flashcards by content.",
+)
 async def search_flashcards(
-    query: str,
-    service: FlashcardService = Depends(get_flashcard_service)
-) -> FlashcardListResponse:
+    query: str, service: FlashcardService = Depends(get_flashcard_service)
+):
     """
     Search for flashcards by content.
-    
+
     - **query**: Search term to look for in front or back content
-    
+
     Returns a list of matching flashcards.
     """
-    try:
-        flashcards = service.search_flashcards(query)
-        flashcard_responses = [
-            FlashcardResponse.from_flashcard(fc) for fc in flashcards
-        ]
-        
-        logger.info(f"API: Found {len(flashcards)} flashcards for query '{query}'")
-        return FlashcardListResponse(
-            flashcards=flashcard_responses,
-            total_count=len(flashcards)
-        )
-    except Exception as e:
-        logger.error(f"API: Error searching flashcards: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error while searching flashcards"
-        )
\ No newline at end of file
+    flashcards = await service.search_flashcards(query)
+
+    logger.info("API: Found %s flashcards for query '%s'", len(flashcards), query)
+    return _flashcard_list_response(flashcards)
@@ -4,108 +4,208 @@ FastAPI application entry point for flashcard learning system.
 
 import logging
 import os
-from pathlib import Path
-from fastapi import FastAPI, Request
+import sys
+import time
+from contextlib import asynccontextmanager
+
+import uvicorn
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-import uvicorn
-import time
+from fastapi.responses import ORJSONResponse
 
-from .storage.file_storage import FileStorageService
+from .api.flashcard_routes import get_flashcard_service
 from .api.flashcard_routes import router as flashcard_router
+from .services.flashcard_service import FlashcardNotFound, FlashcardService
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(
-    title="Flashcard Learning API",
-    description="API for managing flashcards and study sessions",
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
 
-# Include routers
-app.include_router(flashcard_router)
-
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:8080", 
-        "http://127.0.0.1:8080",
-        "http://localhost:3000",  # For development
-        "http://127.0.0.1:3000"
-    ],
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE"],
-    allow_headers=["*"],
-)
+# Map service errors to HTTP responses so routes don't need try/except ladders
 
-# Add trusted host middleware for security
-app.add_middleware(
-    TrustedHostMiddleware, 
-    allowed_hosts=["localhost", "127.0.0.1", "*.localhost"]
-)
 
-# Initialize storage service
-data_dir = Path(__file__).parent.parent / "data"
-storage = FileStorageService(str(data_dir))
-
-
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all requests for monitoring."""
-    start_time = time.time()
-    
-    # Log request
-    logger.info(f"Request: {request.method} {request.url.path}")
-    
-    response = await call_next(request)
-    
-    # Log response time
-    process_time = time.time() - start_time
-    logger.info(f"Response: {response.status_code} in {process_time:.4f}s")
-    
-    return response
-
-
-@app.get("/")
-async def root():
-    """Health check endpoint."""
-    return {
-        "message": "Flashcard Learning API is running",
-        "version": "1.0.0",
-        "status": "healthy"
-    }
-
-
-@app.get("/health")
-async def health():
-    """Comprehensive health check for monitoring."""
-    try:
-        storage_health = storage.health_check()
-        return {
-            "status": "healthy",
-            "version": "1.0.0",
-            "storage": storage_health,
-            "endpoints": {
-                "flashcards": "/api/flashcards",
-                "study": "/api/study"
-            }
-        }
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
+async def flashcard_not_found_handler(request: Request, exc: FlashcardNotFound):
+    """Return 404 for unknown flashcard IDs."""
+    return ORJSONResponse(
+        status_code=status.HTTP_404_NOT_FOUND, content={"detail": str(exc)}
+    )
+
+
+async def value_error_handler(request: Request, exc: ValueError):
+    """Return 422 for business-rule validation failures."""
+    logger.warning(
+        "API: Validation error on %s %s: %s", request.method, request.url.path, exc
+    )
+    return ORJSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, content={"detail": str(exc)}
+    )
+
+
+async def unhandled_error_handler(request: Request, exc: Exception):
+    """Return a generic 500 and log the failure."""
+    logger.error("API: Error on %s %s: %s", request.method, request.url.path, exc)
+    return ORJSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"detail": "Internal server error"},
+    )
+
+
+def _flashcard_service(app: FastAPI) -> FlashcardService:
+    """Get the flashcard service the app's routes use, honouring overrides."""
+    return app.dependency_overrides.get(get_flashcard_service, get_flashcard_service)()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Compact the flashcards log before serving traffic."""
+    # Same storage instance the routes use, so compaction shares their locks
+    await _flashcard_service(app).storage.compact_flashcards()
+    yield
+
+
+class AccessLogMiddleware:
+    """
+    Log all requests for monitoring.
+
+    Implemented as a plain ASGI middleware rather than with
+    ``@app.middleware("http")`` so requests don't pay for the extra task
+    and body wrapping that ``BaseHTTPMiddleware`` adds.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = None
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+        # One line per request; lazy formatting is skipped when INFO is off
+        process_time = time.perf_counter() - start_time
+        logger.info(
+            "%s %s -> %s in %.4fs",
+            scope["method"],
+            scope["path"],
+            status_code,
+            process_time,
+        )
+
+
+def create_app() -> FastAPI:
+    """
+    Build the FastAPI application.
+
+    Each call returns an independent app with its own dependency overrides,
+    so tests can build one per worker. Storage is the process-wide instance
+    behind ``get_flashcard_service``.
+    """
+    app = FastAPI(
+        title="Flashcard Learning API",
+        description="API for managing flashcards and study sessions",
+        version="1.0.0",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
+    )
+
+    # Include routers
+    app.include_router(flashcard_router)
+
+    app.add_exception_handler(FlashcardNotFound, flashcard_not_found_handler)
+    app.add_exception_handler(ValueError, value_error_handler)
+    app.add_exception_handler(Exception, unhandled_error_handler)
+
+    # Configure CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[
+            "http://localhost:8080",
+            "http://127.0.0.1:8080",
+            "http://localhost:3000",  # For development
+            "http://127.0.0.1:3000",
+        ],
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE"],
+        allow_headers=["*"],
+    )
+
+    # Add trusted host middleware for security
+    app.add_middleware(
+        TrustedHostMiddleware, allowed_hosts=["localhost", "127.0.0.1", "*.localhost"]
+    )
+
+    # Compress large responses such as flashcard lists; small ones skip it
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+    app.add_middleware(AccessLogMiddleware)
+
+    @app.get("/")
+    async def root():
+        """Health check endpoint."""
         return {
-            "status": "unhealthy",
+            "message": "Flashcard Learning API is running",
             "version": "1.0.0",
-            "error": str(e)
+            "status": "healthy",
         }
 
+    @app.get("/health")
+    async def health():
+        """Comprehensive health check for monitoring."""
+        try:
+            storage_health = await _flashcard_service(app).storage.health_check()
+            return {
+                "status": "healthy",
+                "version": "1.0.0",
+                "storage": storage_health,
+                "endpoints": {"flashcards": "/api/flashcards", "study": "/api/study"},
+            }
+        except Exception as e:
+            logger.error("Health check failed: %s", e)
+            return {"status": "unhealthy", "version": "1.0.0", "error": str(e)}
+
+    return app
+
+
+app = create_app()
+
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # Run with `python -m src.main` from the backend directory.
+    # Set DEV=1 for a single auto-reloading worker.
+    dev_mode = os.getenv("DEV") == "1"
+    # The file backend's locks are per process, so only SQLite can share
+    # its data across several workers
+    multi_process = (
+        not dev_mode and os.getenv("STORAGE_BACKEND", "file").lower() == "sqlite"
+    )
+    uvicorn.run(
+        "src.main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 2))
+        if multi_process
+        else 1,
+        # uvloop has no Windows build; "auto" falls back to asyncio there
+        loop="auto" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
+        reload=dev_mode,
+    )
@@ -2,16 +2,30 @@
 Flashcard model for the learning system.
 """
 
-from typing import Optional
-from datetime import datetime
-from pydantic import BaseModel, Field, validator
 import uuid
+from datetime import datetime
+from typing import Annotated, Optional
+
+from pydantic import (
+    BaseModel,
+    Field,
+    PrivateAttr,
+    StringConstraints,
+    model_validator,
+    validator,
+)
+
+# Whitespace is stripped by pydantic-core before the length checks run, so
+# front/back need no Python-level validator; other fields are left as given
+FlashcardContent = Annotated[
+    str, StringConstraints(strip_whitespace=True, min_length=1, max_length=500)
+]
 
 
 class Flashcard(BaseModel):
     """
     A flashcard with front and back content for language learning.
-    
+
     Attributes:
         id: Unique identifier for the flashcard
         front: Text content shown first (question/prompt)
@@ -21,53 +35,95 @@ class Flashcard(BaseModel):
         study_count: Number of times this flashcard has been studied
         correct_count: Number of times answered correctly
     """
-    
+
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    front: str = Field(..., min_length=1, max_length=500)
-    back: str = Field(..., min_length=1, max_length=500)
+    front: FlashcardContent
+    back: FlashcardContent
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     study_count: int = Field(default=0, ge=0)
     correct_count: int = Field(default=0, ge=0)
-    
-    @validator('front', 'back')
-    def validate_content(cls, v):
-        """Validate that content is not empty after stripping whitespace."""
-        if not v or not v.strip():
-            raise ValueError('Content cannot be empty or whitespace only')
-        return v.strip()
-    
-    @validator('correct_count')
+
+    # ISO-8601 renderings of the timestamps, cached so responses don't
+    # re-format them on every serialization
+    _created_at_iso: str = PrivateAttr(default="")
+    _updated_at_iso: str = PrivateAttr(default="")
+    # Kept in step with the study counts by __setattr__
+    _accuracy: float = PrivateAttr(default=0.0)
+
+    @model_validator(mode="before")
+    @classmethod
+    def default_timestamps(cls, data):
+        """Stamp missing created_at/updated_at from a single clock read."""
+        if isinstance(data, dict) and (
+            "created_at" not in data or "updated_at" not in data
+        ):
+            now = datetime.utcnow()
+            data = {"created_at": now, "updated_at": now, **data}
+        return data
+
+    def model_post_init(self, __context):
+        """Cache the formatted timestamps and accuracy once the model is validated."""
+        # Set all private state in one assignment: going through
+        # BaseModel.__setattr__ per attribute costs more than validation itself
+        self.__pydantic_private__ = {
+            "_created_at_iso": self.created_at.isoformat(),
+            "_updated_at_iso": self.updated_at.isoformat(),
+            "_accuracy": self._compute_accuracy(),
+        }
+
+    def __setattr__(self, name, value):
+        """Assign a field, refreshing the cached values derived from it."""
+        super().__setattr__(name, value)
+        private = self.__pydantic_private__
+        if name == "created_at":
+            private["_created_at_iso"] = self.created_at.isoformat()
+        elif name == "updated_at":
+            private["_updated_at_iso"] = self.updated_at.isoformat()
+        elif name in ("study_count", "correct_count"):
+            private["_accuracy"] = self._compute_accuracy()
+
+    def _compute_accuracy(self) -> float:
+        """Compute accuracy from the study counts."""
+        return self.correct_count / self.study_count if self.study_count else 0.0
+
+    @validator("correct_count")
     def validate_correct_count(cls, v, values):
         """Ensure correct_count doesn't exceed study_count."""
-        study_count = values.get('study_count', 0)
+        study_count = values.get("study_count", 0)
         if v > study_count:
-            raise ValueError('Correct count cannot exceed study count')
+            raise ValueError("Correct count cannot exceed study count")
         return v
-    
+
     def update_content(self, front: Optional[str] = None, back: Optional[str] = None):
         """Update flashcard content and timestamp."""
         if front is not None:
             self.front = front
         if back is not None:
             self.back = back
+        self.touch()
+
+    def touch(self):
+        """Set updated_at to now."""
         self.updated_at = datetime.utcnow()
-    
+
+    @property
+    def created_at_iso(self) -> str:
+        """ISO-8601 string for created_at."""
+        return self._created_at_iso
+
+    @property
+    def updated_at_iso(self) -> str:
+        """ISO-8601 string for updated_at."""
+        return self._updated_at_iso
+
     def record_study_result(self, correct: bool):
         """Record a study session result."""
         self.study_count += 1
         if correct:
             self.correct_count += 1
-    
+
     @property
     def accuracy(self) -> float:
-        """Calculate accuracy percentage (0.0 to 1.0)."""
-        if self.study_count == 0:
-            return 0.0
-        return self.correct_count / self.study_count
-    
-    class Config:
-        """Pydantic configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
\ No newline at end of file
+        """Accuracy percentage (0.0 to 1.0)."""
+        return self._accuracy
@@ -3,254 +3,510 @@ FlashcardService for managing flashcard business logic.
 """
 
 import logging
-from typing import List, Optional
+import re
+from collections import OrderedDict, defaultdict
 from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
 
 from ..models.flashcard import Flashcard
-from ..storage.file_storage import FileStorageService
+from ..storage.base import FlashcardNotFound, StorageService
 
 logger = logging.getLogger(__name__)
 
+_TOKEN_RE = re.compile(r"\w+")
+
+# Maximum length of a flashcard side after stripping
+MAX_CONTENT_LENGTH = 500
+
+
+def _normalize_id(flashcard_id: Optional[str]) -> str:
+    """
+    Strip a flashcard ID and make sure it is not empty.
+
+    Raises:
+        ValueError: If the ID is missing or blank
+    """
+    normalized = (flashcard_id or "").strip()
+    if not normalized:
+        raise ValueError("Flashcard ID cannot be empty")
+    return normalized
+
+
+def _validate_content(text: object, field_name: str) -> str:
+    """
+    Strip and validate one side of a flashcard.
+
+    Args:
+        text: Raw content
+        field_name: "Front" or "Back", used in error messages
+
+    Returns:
+        The stripped content
+
+    Raises:
+        ValueError: If the content is empty or too long
+    """
+    if not isinstance(text, str):
+        raise ValueError(f"{field_name} content cannot be empty")
+
+    # Oversized input with nothing to strip at either end can be rejected
+    # without copying it first
+    if (
+        len(text) > MAX_CONTENT_LENGTH
+        and not text[0].isspace()
+        and not text[-1].isspace()
+    ):
+        raise ValueError(
+            f"{field_name} content too long (max {MAX_CONTENT_LENGTH} characters)"
+        )
+
+    stripped = text.strip()
+    if not stripped:
+        raise ValueError(f"{field_name} content cannot be empty")
+    if len(stripped) > MAX_CONTENT_LENGTH:
+        raise ValueError(
+            f"{field_name} content too long (max {MAX_CONTENT_LENGTH} characters)"
+        )
+    return stripped
+
 
 class FlashcardService:
     """
     Service layer for flashcard operations.
-    
+
     This service provides business logic for flashcard management,
     including validation, creation, updates, and retrieval.
     """
-    
-    def __init__(self, storage: FileStorageService):
+
+    # Number of distinct search queries whose results are memoized
+    SEARCH_CACHE_SIZE = 128
+
+    def __init__(self, storage: StorageService):
         """
         Initialize the flashcard service.
-        
+
         Args:
-            storage: File storage service instance
+            storage: Storage service instance
         """
         self.storage = storage
-    
-    def create_flashcard(self, front: str, back: str) -> Flashcard:
+
+        # Cached result of get_all_flashcards, keyed by the flashcards file mtime
+        self._cache: Optional[List[Flashcard]] = None
+        self._cache_mtime: Optional[int] = None
+
+        # Search index over the cached list: token -> flashcard IDs, each
+        # ID's lowercased (front, back) and its position so results keep
+        # collection order
+        self._index: Dict[str, Set[str]] = {}
+        self._vocabulary = ""
+        self._lowered: Dict[str, Tuple[str, str]] = {}
+        self._positions: Dict[str, int] = {}
+        self._index_source: Optional[List[Flashcard]] = None
+
+        # LRU of lowercased query -> IDs of the results, reset with the index
+        self._search_cache: "OrderedDict[str, List[str]]" = OrderedDict()
+
+    def _invalidate_cache(self):
+        """Drop the cached flashcard list after a write."""
+        self._cache = None
+        self._cache_mtime = None
+
+    def _build_flashcard(
+        self, front: str, back: str, now: Optional[datetime] = None
+    ) -> Flashcard:
+        """
+        Validate new flashcard content and build the model.
+
+        Args:
+            front: Front content
+            back: Back content
+            now: Creation timestamp to use instead of reading the clock
+
+        Raises:
+            ValueError: If content validation fails
+        """
+        # Input validation
+        if front is None or back is None:
+            raise ValueError("Front and back content cannot be None")
+
+        # Create flashcard model
+        fields = {
+            "front": _validate_content(front, "Front"),
+            "back": _validate_content(back, "Back"),
+        }
+        if now is not None:
+            fields["created_at"] = fields["updated_at"] = now
+        return Flashcard(**fields)
+
+    async def create_flashcard(self, front: str, back: str) -> Flashcard:
         """
         Create a new flashcard with validation.
-        
+
         Args:
             front: Front content (question/prompt)
             back: Back content (answer/translation)
-            
+
         Returns:
             Created flashcard instance
-            
+
         Raises:
             ValueError: If content validation fails
         """
-        # Input validation
-        if front is None or back is None:
-            raise ValueError("Front and back content cannot be None")
-        
-        # Strip whitespace and validate
-        front_stripped = front.strip() if isinstance(front, str) else ""
-        back_stripped = back.strip() if isinstance(back, str) else ""
-        
-        if not front_stripped:
-            raise ValueError("Front content cannot be empty")
-        
-        if not back_stripped:
-            raise ValueError("Back content cannot be empty")
-        
-        # Length validation (constitution compliance)
-        if len(front_stripped) > 500:
-            raise ValueError("Front content too long (max 500 characters)")
-        
-        if len(back_stripped) > 500:
-            raise ValueError("Back content too long (max 500 characters)")
-        
-        # Create flashcard model
-        flashcard = Flashcard(
-            front=front_stripped,
-            back=back_stripped
-        )
-        
+        flashcard = self._build_flashcard(front, back)
+
         # Persist to storage
         try:
-            created_flashcard = self.storage.create_flashcard(flashcard)
-            logger.info(f"Created flashcard {created_flashcard.id}")
+            created_flashcard = await self.storage.create_flashcard(flashcard)
+            self._invalidate_cache()
+            logger.info("Created flashcard %s", created_flashcard.id)
             return created_flashcard
         except Exception as e:
-            logger.error(f"Failed to create flashcard: {e}")
+            logger.error("Failed to create flashcard: %s", e)
+            raise
+
+    async def bulk_create_flashcards(
+        self, items: List[Tuple[str, str]]
+    ) -> List[Flashcard]:
+        """
+        Create several flashcards with a single storage write.
+
+        Every item is validated before anything is persisted, so the batch
+        is stored either completely or not at all.
+
+        Args:
+            items: (front, back) content pairs
+
+        Returns:
+            Created flashcard instances, in input order
+
+        Raises:
+            ValueError: If content validation fails for any item; the
+                message lists every invalid item
+        """
+        flashcards = []
+        errors = []
+        # One clock read for the whole batch: the cards are created together
+        now = datetime.utcnow()
+        for i, (front, back) in enumerate(items):
+            try:
+                flashcards.append(self._build_flashcard(front, back, now))
+            except ValueError as e:
+                errors.append(f"Item {i}: {e}")
+
+        if errors:
+            raise ValueError("; ".join(errors))
+
+        if not flashcards:
+            return []
+
+        try:
+            created_flashcards = await self.storage.create_flashcards(flashcards)
+            self._invalidate_cache()
+            logger.info("Created %s flashcards in bulk", len(created_flashcards))
+            return created_flashcards
+        except Exception as e:
+            logger.error("Failed to bulk create flashcards: %s", e)
             raise
-    
-    def get_flashcard(self, flashcard_id: str) -> Optional[Flashcard]:
+
+    async def get_flashcard(self, flashcard_id: str) -> Optional[Flashcard]:
         """
         Get a flashcard by ID.
-        
+
         Args:
             flashcard_id: Unique flashcard identifier
-            
+
         Returns:
             Flashcard instance or None if not found
         """
-        if not flashcard_id or not flashcard_id.strip():
-            raise ValueError("Flashcard ID cannot be empty")
-        
+        flashcard_id = _normalize_id(flashcard_id)
+
         try:
-            return self.storage.get_flashcard(flashcard_id.strip())
+            return await self.storage.get_flashcard(flashcard_id)
         except Exception as e:
-            logger.error(f"Failed to get flashcard {flashcard_id}: {e}")
+            logger.error("Failed to get flashcard %s: %s", flashcard_id, e)
             raise
-    
-    def get_all_flashcards(self) -> List[Flashcard]:
+
+    async def _cached_flashcards(self) -> List[Flashcard]:
+        """
+        Get the cached flashcard list, reloading it if the file changed.
+
+        The returned list and its flashcards are shared; callers must not
+        mutate them.
+        """
+        mtime = self.storage.get_flashcards_mtime()
+        if self._cache is None or mtime != self._cache_mtime:
+            self._cache = await self.storage.get_all_flashcards()
+            self._cache_mtime = mtime
+        return self._cache
+
+    async def get_all_flashcards(self) -> List[Flashcard]:
         """
         Get all flashcards in the collection.
-        
+
+        The list is served from memory until the flashcards file changes
+        on disk or this service writes to it. Callers get copies, so
+        changing a returned flashcard never alters the cache.
+
         Returns:
             List of all flashcards
         """
         try:
-            return self.storage.get_all_flashcards()
+            return [
+                flashcard.model_copy() for flashcard in await self._cached_flashcards()
+            ]
         except Exception as e:
-            logger.error(f"Failed to get all flashcards: {e}")
+            logger.error("Failed to get all flashcards: %s", e)
             raise
-    
-    def update_flashcard(self, flashcard_id: str, front: Optional[str] = None, 
-                        back: Optional[str] = None) -> Flashcard:
+
+    async def update_flashcard(
+        self, flashcard_id: str, front: Optional[str] = None, back: Optional[str] = None
+    ) -> Flashcard:
         """
         Update an existing flashcard.
-        
+
         Args:
             flashcard_id: Unique flashcard identifier
             front: New front content (optional)
             back: New back content (optional)
-            
+
         Returns:
             Updated flashcard instance
-            
+
         Raises:
-            ValueError: If validation fails or flashcard not found
+            FlashcardNotFound: If the flashcard does not exist
+            ValueError: If validation fails
         """
-        if not flashcard_id or not flashcard_id.strip():
-            raise ValueError("Flashcard ID cannot be empty")
-        
+        flashcard_id = _normalize_id(flashcard_id)
+
         # Get existing flashcard
-        flashcard = self.storage.get_flashcard(flashcard_id.strip())
+        flashcard = await self.storage.get_flashcard(flashcard_id)
         if not flashcard:
-            raise ValueError(f"Flashcard {flashcard_id} not found")
-        
+            raise FlashcardNotFound(flashcard_id)
+
         # Validate and update content if provided
         if front is not None:
-            front_stripped = front.strip() if isinstance(front, str) else ""
-            if not front_stripped:
-                raise ValueError("Front content cannot be empty")
-            if len(front_stripped) > 500:
-                raise ValueError("Front content too long (max 500 characters)")
-            flashcard.front = front_stripped
-        
+            flashcard.front = _validate_content(front, "Front")
+
         if back is not None:
-            back_stripped = back.strip() if isinstance(back, str) else ""
-            if not back_stripped:
-                raise ValueError("Back content cannot be empty")
-            if len(back_stripped) > 500:
-                raise ValueError("Back content too long (max 500 characters)")
-            flashcard.back = back_stripped
-        
-        # Update timestamp
-        flashcard.updated_at = datetime.utcnow()
-        
-        # Persist changes
+            flashcard.back = _validate_content(back, "Back")
+
+        # Persist changes; storage stamps updated_at as it writes
         try:
-            updated_flashcard = self.storage.update_flashcard(flashcard)
-            logger.info(f"Updated flashcard {flashcard_id}")
+            updated_flashcard = await self.storage.update_flashcard(flashcard)
+            self._invalidate_cache()
+            logger.info("Updated flashcard %s", flashcard_id)
             return updated_flashcard
         except Exception as e:
-            logger.error(f"Failed to update flashcard {flashcard_id}: {e}")
+            logger.error("Failed to update flashcard %s: %s", flashcard_id, e)
             raise
-    
-    def delete_flashcard(self, flashcard_id: str) -> bool:
+
+    async def delete_flashcard(self, flashcard_id: str) -> bool:
         """
         Delete a flashcard by ID.
-        
+
         Args:
             flashcard_id: Unique flashcard identifier
-            
+
         Returns:
             True if deleted, False if not found
         """
-        if not flashcard_id or not flashcard_id.strip():
-            raise ValueError("Flashcard ID cannot be empty")
-        
+        flashcard_id = _normalize_id(flashcard_id)
+
         try:
-            result = self.storage.delete_flashcard(flashcard_id.strip())
+            result = await self.storage.delete_flashcard(flashcard_id)
             if result:
-                logger.info(f"Deleted flashcard {flashcard_id}")
+                self._invalidate_cache()
+                logger.info("Deleted flashcard %s", flashcard_id)
             else:
-                logger.warning(f"Flashcard {flashcard_id} not found for deletion")
+                logger.warning("Flashcard %s not found for deletion", flashcard_id)
             return result
         except Exception as e:
-            logger.error(f"Failed to delete flashcard {flashcard_id}: {e}")
+            logger.error("Failed to delete flashcard %s: %s", flashcard_id, e)
             raise
-    
-    def get_flashcard_count(self) -> int:
+
+    async def get_flashcard_count(self) -> int:
         """
         Get the total number of flashcards.
-        
+
         Returns:
             Total flashcard count
         """
         try:
-            return self.storage.get_flashcards_count()
+            # The cached list already knows the answer while the file is unchanged
+            if (
+                self._cache is not None
+                and self.storage.get_flashcards_mtime() == self._cache_mtime
+            ):
+                return len(self._cache)
+            return await self.storage.get_flashcards_count()
         except Exception as e:
-            logger.error(f"Failed to get flashcard count: {e}")
+            logger.error("Failed to get flashcard count: %s", e)
             raise
-    
-    def search_flashcards(self, query: str) -> List[Flashcard]:
+
+    async def search_flashcards(self, query: str) -> List[Flashcard]:
         """
         Search flashcards by content.
-        
+
         Args:
             query: Search query string
-            
+
         Returns:
             List of matching flashcards
         """
-        if not query or not query.strip():
+        query_lower = (query or "").strip().lower()
+        if not query_lower:
             return []
-        
-        query_lower = query.strip().lower()
-        
+
         try:
-            all_flashcards = self.storage.get_all_flashcards()
-            matching_flashcards = [
-                flashcard for flashcard in all_flashcards
-                if (query_lower in flashcard.front.lower() or 
-                    query_lower in flashcard.back.lower())
+            all_flashcards = await self._cached_flashcards()
+            if self._index_source is not all_flashcards:
+                self._build_search_index(all_flashcards)
+
+            cached = self._search_cache.get(query_lower)
+            if cached is not None:
+                self._search_cache.move_to_end(query_lower)
+                return [
+                    flashcard.model_copy()
+                    for flashcard in self._flashcards_by_id(cached)
+                ]
+
+            # Anything matching the query also matches every substring of it,
+            # so as-you-type queries only need to re-check a previous result
+            candidate_ids = self._memoized_candidates(query_lower)
+            if candidate_ids is None:
+                candidates = self._search_candidates(query_lower, all_flashcards)
+            else:
+                candidates = self._flashcards_by_id(candidate_ids)
+
+            lowered = self._lowered
+            matching_flashcards = []
+            for flashcard in candidates:
+                front_lower, back_lower = lowered[flashcard.id]
+                if query_lower in front_lower or query_lower in back_lower:
+                    matching_flashcards.append(flashcard)
+
+            self._search_cache[query_lower] = [
+                flashcard.id for flashcard in matching_flashcards
             ]
-            
-            logger.info(f"Found {len(matching_flashcards)} flashcards matching '{query}'")
-            return matching_flashcards
+            if len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+
+            logger.info(
+                "Found %s flashcards matching '%s'", len(matching_flashcards), query
+            )
+            # Copies, so callers can't change the cached flashcards
+            return [flashcard.model_copy() for flashcard in matching_flashcards]
         except Exception as e:
-            logger.error(f"Failed to search flashcards: {e}")
+            logger.error("Failed to search flashcards: %s", e)
             raise
-    
-    def get_study_candidates(self, limit: Optional[int] = None) -> List[Flashcard]:
+
+    def _memoized_candidates(self, query_lower: str) -> Optional[List[str]]:
+        """Get the IDs of the smallest memoized result for a substring of the query."""
+        best: Optional[List[str]] = None
+        for cached_query, results in self._search_cache.items():
+            if cached_query in query_lower and (
+                best is None or len(results) < len(best)
+            ):
+                best = results
+        return best
+
+    def _flashcards_by_id(self, flashcard_ids: List[str]) -> List[Flashcard]:
+        """Look up indexed flashcards by ID, keeping the given order."""
+        source = self._index_source
+        positions = self._positions
+        return [source[positions[flashcard_id]] for flashcard_id in flashcard_ids]
+
+    def _build_search_index(self, flashcards: List[Flashcard]):
+        """Index the words of every flashcard's front and back."""
+        index: Dict[str, Set[str]] = defaultdict(set)
+        lowered: Dict[str, Tuple[str, str]] = {}
+        for flashcard in flashcards:
+            front_lower = flashcard.front.lower()
+            back_lower = flashcard.back.lower()
+            lowered[flashcard.id] = (front_lower, back_lower)
+            for token in _TOKEN_RE.findall(f"{front_lower} {back_lower}"):
+                index[token].add(flashcard.id)
+
+        self._index = dict(index)
+        # Every indexed word on its own line, for scanning in native code
+        self._vocabulary = "\n".join(self._index)
+        self._lowered = lowered
+        self._positions = {flashcard.id: i for i, flashcard in enumerate(flashcards)}
+        self._index_source = flashcards
+        self._search_cache.clear()
+
+    def _search_candidates(
+        self, query_lower: str, all_flashcards: List[Flashcard]
+    ) -> List[Flashcard]:
+        """
+        Narrow a search down to flashcards that can possibly match.
+
+        Every word in a substring match lies inside some indexed word, so
+        a card is a candidate only if each query word is contained in one
+        of its words. Callers still verify the full substring match.
+        """
+        query_tokens = _TOKEN_RE.findall(query_lower)
+        if not query_tokens or self._index_source is None:
+            return all_flashcards
+
+        candidate_ids: Optional[Set[str]] = None
+        for query_token in set(query_tokens):
+            token_ids: Set[str] = set()
+            for token in self._tokens_containing(query_token):
+                token_ids |= self._index[token]
+            candidate_ids = (
+                token_ids if candidate_ids is None else candidate_ids & token_ids
+            )
+            if not candidate_ids:
+                return []
+
+        positions = sorted(
+            self._positions[flashcard_id] for flashcard_id in candidate_ids
+        )
+        return [self._index_source[i] for i in positions]
+
+    def _tokens_containing(self, query_token: str) -> List[str]:
+        """
+        Find the indexed words that contain query_token.
+
+        str.find scans the joined vocabulary in C, so Python only does
+        work for words that actually match.
+        """
+        vocabulary = self._vocabulary
+        tokens = []
+        pos = vocabulary.find(query_token)
+        while pos != -1:
+            start = vocabulary.rfind("\n", 0, pos) + 1
+            end = vocabulary.find("\n", pos)
+            if end == -1:
+                end = len(vocabulary)
+            tokens.append(vocabulary[start:end])
+            pos = vocabulary.find(query_token, end)
+        return tokens
+
+    async def get_study_candidates(
+        self, limit: Optional[int] = None
+    ) -> List[Flashcard]:
         """
         Get flashcards suitable for study session.
-        
+
         Args:
             limit: Maximum number of flashcards to return
-            
+
         Returns:
             List of flashcards for study
         """
         try:
-            all_flashcards = self.storage.get_all_flashcards()
-            
+            all_flashcards = await self.get_all_flashcards()
+
             # For now, return all flashcards (future: implement spaced repetition)
             study_cards = all_flashcards
-            
+
             if limit and limit > 0:
                 study_cards = study_cards[:limit]
-            
-            logger.info(f"Selected {len(study_cards)} flashcards for study")
+
+            logger.info("Selected %s flashcards for study", len(study_cards))
             return study_cards
         except Exception as e:
-            logger.error(f"Failed to get study candidates: {e}")
-            raise
\ No newline at end of file
+            logger.error("Failed to get study candidates: %s", e)
+            raise
@@ -0,0 +1,347 @@
+"""
+Shared base for the storage services: data directory, file cache and study sessions.
+"""
+
+import heapq
+import logging
+import os
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+import aiofiles
+import aiofiles.os
+import orjson
+
+from ..models.flashcard import Flashcard
+from ..models.study_session import StudySession
+
+logger = logging.getLogger(__name__)
+
+_fsync = aiofiles.os.wrap(os.fsync)
+_listdir = aiofiles.os.wrap(os.listdir)
+
+
+def _scan_json_files(directory: Path) -> List[Tuple[int, str]]:
+    """List (mtime_ns, path) for every .json file in a directory."""
+    with os.scandir(directory) as entries:
+        return [
+            (entry.stat().st_mtime_ns, entry.path)
+            for entry in entries
+            if entry.name.endswith(".json") and entry.is_file()
+        ]
+
+
+_scan_json_files_async = aiofiles.os.wrap(_scan_json_files)
+
+# Session IDs become file names, so only allow characters that are safe there
+_SESSION_ID_RE = re.compile(r"[A-Za-z0-9_-]+")
+
+
+class FlashcardNotFound(ValueError):
+    """Raised when a flashcard ID does not exist."""
+
+    def __init__(self, flashcard_id: str):
+        super().__init__(f"Flashcard {flashcard_id} not found")
+        self.flashcard_id = flashcard_id
+
+
+class StorageService:
+    """
+    Base class for the storage services.
+
+    Handles what every backend shares: the data directory, study sessions
+    and the parsed-file cache. Subclasses store flashcards and implement
+    the flashcard operations.
+
+    Each study session is stored in its own ``sessions/<session_id>.json``
+    file, so saving a session rewrites only that session. Session files
+    are replaced atomically, so reads take no lock.
+
+    Parsed file contents are cached in memory keyed by the file's
+    modification time and size, so repeated reads of an unchanged file
+    skip both the disk read and the JSON parse. Cached data is shared and
+    must be treated as read-only by callers.
+    """
+
+    # How long after a directory's mtime its listing is trusted not to change
+    # without moving the mtime (covers coarse, e.g. 1s, filesystem timestamps)
+    MTIME_SETTLE_NS = 2_000_000_000
+
+    def __init__(self, data_dir: str = "data"):
+        """
+        Initialize the storage service.
+
+        Args:
+            data_dir: Directory to store data files
+        """
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(exist_ok=True)
+
+        self.sessions_dir = self.data_dir / "sessions"
+        self.legacy_sessions_file = self.data_dir / "study_sessions.json"
+
+        # Parsed file contents keyed by path, tagged with the (mtime_ns, size)
+        # signature of the file they were read from
+        self._cache: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+        # (sessions directory mtime_ns, number of sessions in it)
+        self._sessions_count: Optional[Tuple[int, int]] = None
+
+        # Initialize files if they don't exist
+        self._ensure_files_exist()
+
+    def _ensure_files_exist(self):
+        """Create the sessions directory if it doesn't exist."""
+        # Runs once at construction time, so plain blocking writes are fine here
+        if not self.sessions_dir.exists():
+            self._migrate_legacy_sessions()
+
+    def _migrate_legacy_sessions(self):
+        """Create the sessions directory, splitting up the old single sessions file."""
+        self.sessions_dir.mkdir()
+        if not self.legacy_sessions_file.exists():
+            return
+
+        try:
+            legacy_data = orjson.loads(self.legacy_sessions_file.read_bytes())
+        except orjson.JSONDecodeError as e:
+            logger.error("Error loading %s: %s", self.legacy_sessions_file, e)
+            return
+
+        migrated = 0
+        for session_dict in legacy_data:
+            session_file = self._session_file(str(session_dict.get("session_id", "")))
+            if session_file is None:
+                continue
+            session_file.write_bytes(orjson.dumps(session_dict))
+            migrated += 1
+        logger.info(
+            "Migrated %s study sessions from %s", migrated, self.legacy_sessions_file
+        )
+
+    @staticmethod
+    def _file_signature(file_path: Path) -> Optional[Tuple[int, int]]:
+        """Get the (mtime_ns, size) pair used to validate cached file contents."""
+        try:
+            st = file_path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _get_cached(self, file_path: Path, signature: Optional[Tuple[int, int]]) -> Any:
+        """Get cached contents of a file if they match its current signature."""
+        entry = self._cache.get(file_path)
+        if entry is not None and signature is not None and entry[0] == signature:
+            return entry[1]
+        return None
+
+    async def _load_json(self, file_path: Path) -> Any:
+        """
+        Load and parse JSON file without blocking the event loop.
+
+        Returns:
+            The parsed data, shared with the cache, or None if the file is
+            missing or unreadable
+        """
+        # Stat before reading: if the file changes in between, the cached
+        # signature is already stale and the next load re-reads it
+        signature = self._file_signature(file_path)
+        cached = self._get_cached(file_path, signature)
+        if cached is not None:
+            return cached
+
+        try:
+            async with aiofiles.open(file_path, "rb") as f:
+                raw = await f.read()
+            data = orjson.loads(raw)
+        except FileNotFoundError:
+            self._cache.pop(file_path, None)
+            return None
+        except orjson.JSONDecodeError as e:
+            self._cache.pop(file_path, None)
+            logger.error("Error loading %s: %s", file_path, e)
+            return None
+
+        self._cache[file_path] = (signature, data)
+        return data
+
+    async def _write_temp_file(self, file_path: Path, raw: bytes) -> Path:
+        """
+        Write data to a uniquely named sibling of file_path and flush it to disk.
+
+        The caller swaps it into place with os.replace, so readers only ever
+        see the old contents or the complete new ones.
+        """
+        tmp_file = file_path.with_name(f"{file_path.name}.{uuid4().hex}.tmp")
+        try:
+            async with aiofiles.open(tmp_file, "wb") as f:
+                await f.write(raw)
+                await f.flush()
+                await _fsync(f.fileno())
+        except Exception:
+            tmp_file.unlink(missing_ok=True)
+            raise
+        return tmp_file
+
+    async def _save_json(self, file_path: Path, data: Any):
+        """Atomically save data to JSON file without blocking the event loop."""
+        try:
+            raw = orjson.dumps(data)
+            tmp_file = await self._write_temp_file(file_path, raw)
+            try:
+                await aiofiles.os.replace(tmp_file, file_path)
+            except Exception:
+                tmp_file.unlink(missing_ok=True)
+                raise
+        except Exception as e:
+            self._cache.pop(file_path, None)
+            logger.error("Error saving %s: %s", file_path, e)
+            raise
+
+        self._cache[file_path] = (self._file_signature(file_path), data)
+
+    # Flashcard operations, implemented by each backend
+
+    async def create_flashcard(self, flashcard: Flashcard) -> Flashcard:
+        """Create a new flashcard."""
+        raise NotImplementedError
+
+    async def create_flashcards(self, flashcards: List[Flashcard]) -> List[Flashcard]:
+        """Create several flashcards with a single write."""
+        raise NotImplementedError
+
+    async def get_flashcard(self, flashcard_id: str) -> Optional[Flashcard]:
+        """Get a flashcard by ID."""
+        raise NotImplementedError
+
+    async def get_all_flashcards(self) -> List[Flashcard]:
+        """Get all flashcards in creation order."""
+        raise NotImplementedError
+
+    async def update_flashcard(self, flashcard: Flashcard) -> Flashcard:
+        """
+        Update an existing flashcard.
+
+        Raises:
+            FlashcardNotFound: If the flashcard does not exist
+        """
+        raise NotImplementedError
+
+    async def delete_flashcard(self, flashcard_id: str) -> bool:
+        """Delete a flashcard by ID."""
+        raise NotImplementedError
+
+    def get_flashcards_mtime(self) -> int:
+        """Get the modification time of the flashcard data in nanoseconds."""
+        raise NotImplementedError
+
+    async def get_flashcards_count(self) -> int:
+        """Get the total number of flashcards."""
+        raise NotImplementedError
+
+    async def compact_flashcards(self):
+        """Reclaim space left behind by flashcard updates and deletes."""
+        raise NotImplementedError
+
+    # Study session operations
+
+    def _session_file(self, session_id: str) -> Optional[Path]:
+        """Get a session's file, or None if the ID isn't a safe file name."""
+        if not _SESSION_ID_RE.fullmatch(session_id):
+            return None
+        return self.sessions_dir / f"{session_id}.json"
+
+    async def create_study_session(self, session: StudySession) -> StudySession:
+        """Create a new study session."""
+        session_file = self._session_file(session.session_id)
+        if session_file is None:
+            raise ValueError(f"Invalid study session ID {session.session_id!r}")
+
+        await self._save_json(session_file, session.model_dump())
+
+        logger.info("Created study session %s", session.session_id)
+        return session
+
+    async def get_study_session(self, session_id: str) -> Optional[StudySession]:
+        """Get a study session by ID."""
+        session_file = self._session_file(session_id)
+        if session_file is None:
+            return None
+
+        session_dict = await self._load_json(session_file)
+        if session_dict is None:
+            return None
+        return StudySession(**session_dict)
+
+    async def update_study_session(self, session: StudySession) -> StudySession:
+        """Update an existing study session."""
+        session_file = self._session_file(session.session_id)
+        if session_file is None or not session_file.exists():
+            raise ValueError(f"Study session {session.session_id} not found")
+
+        await self._save_json(session_file, session.model_dump())
+        logger.info("Updated study session %s", session.session_id)
+        return session
+
+    async def get_recent_sessions(self, limit: int = 10) -> List[StudySession]:
+        """
+        Get recently active study sessions, most recent first.
+
+        Sessions are ranked by their file's modification time, i.e. when
+        they were last saved, so only the returned sessions are read and
+        parsed.
+        """
+        session_files = await _scan_json_files_async(self.sessions_dir)
+
+        sessions = []
+        for _, path in heapq.nlargest(limit, session_files):
+            session_dict = await self._load_json(Path(path))
+            # Skip files that vanished or were unreadable since the scan
+            if session_dict is not None:
+                sessions.append(StudySession(**session_dict))
+        return sessions
+
+    async def get_sessions_count(self) -> int:
+        """
+        Get the total number of stored study sessions.
+
+        The count is cached against the sessions directory's mtime, which
+        changes whenever a file is added, removed or renamed into it.
+        """
+        mtime_ns = self.sessions_dir.stat().st_mtime_ns
+        if self._sessions_count is not None and self._sessions_count[0] == mtime_ns:
+            return self._sessions_count[1]
+
+        names = await _listdir(self.sessions_dir)
+        count = sum(1 for name in names if name.endswith(".json"))
+        # A change within the same timestamp tick as mtime_ns would not move
+        # the mtime, so only trust counts taken once that tick is well past
+        if time.time_ns() - mtime_ns > self.MTIME_SETTLE_NS:
+            self._sessions_count = (mtime_ns, count)
+        return count
+
+    # Health and utility methods
+
+    async def health_check(self) -> Dict[str, Any]:
+        """Perform a health check on the storage system."""
+        try:
+            flashcard_count = await self.get_flashcards_count()
+            session_count = await self.get_sessions_count()
+
+            return {
+                "status": "healthy",
+                "flashcard_count": flashcard_count,
+                "session_count": session_count,
+                "data_dir": str(self.data_dir),
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+        except Exception as e:
+            logger.error("Storage health check failed: %s", e)
+            return {
+                "status": "unhealthy",
+                "error": str(e),
+                "timestamp": datetime.utcnow().isoformat(),
+            }
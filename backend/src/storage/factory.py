@@ -0,0 +1,30 @@
+"""
+Selection of the storage backend.
+"""
+
+import os
+
+from .base import StorageService
+from .file_storage import FileStorageService
+from .sqlite_storage import SQLiteStorageService
+
+
+def create_storage_service(data_dir: str) -> StorageService:
+    """
+    Create the storage service chosen by the STORAGE_BACKEND environment variable.
+
+    ``file`` (the default) keeps flashcards in a JSON Lines log; ``sqlite``
+    keeps them in a SQLite database in WAL mode. Both store study sessions
+    as per-session files.
+
+    Args:
+        data_dir: Directory to store data files
+    """
+    backend = os.environ.get("STORAGE_BACKEND", "file").lower()
+    if backend == "sqlite":
+        return SQLiteStorageService(data_dir)
+    if backend != "file":
+        raise ValueError(
+            f"Unknown STORAGE_BACKEND {backend!r}, expected 'file' or 'sqlite'"
+        )
+    return FileStorageService(data_dir)
@@ -0,0 +1,308 @@
+"""
+SQLite-backed storage service for flashcards.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
+
+from ..models.flashcard import Flashcard
+from .base import FlashcardNotFound, StorageService
+from .file_storage import _from_epoch_ns, _replay_lines, _to_epoch_ns
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS flashcards (
+    id TEXT PRIMARY KEY,
+    front TEXT NOT NULL,
+    back TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    study_count INTEGER NOT NULL DEFAULT 0,
+    correct_count INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+_COLUMNS = "id, front, back, created_at, updated_at, study_count, correct_count"
+
+# PRAGMA user_version once the file storage flashcards have been imported
+_IMPORTED_VERSION = 1
+
+
+class SQLiteStorageService(StorageService):
+    """
+    Storage service keeping flashcards in a SQLite database.
+
+    Flashcards live in ``flashcards.db`` in WAL mode, so point operations
+    are indexed lookups, each write touches one row, and readers in other
+    processes never block on a writer. Study sessions use the per-file
+    layout of StorageService.
+
+    sqlite3 calls block, so they run in worker threads over a single
+    connection guarded by a lock.
+    """
+
+    def __init__(self, data_dir: str = "data"):
+        """
+        Initialize the storage service.
+
+        Args:
+            data_dir: Directory to store data files
+        """
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        super().__init__(data_dir)
+
+    def _ensure_files_exist(self):
+        """Open the database, importing any existing flashcards log on first use."""
+        super()._ensure_files_exist()
+
+        self.db_file = self.data_dir / "flashcards.db"
+        self._conn = sqlite3.connect(
+            str(self.db_file), isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL keeps the database consistent without a sync on every commit
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        try:
+            self._import_file_flashcards()
+        except Exception:
+            self.close()
+            raise
+
+    def _imported(self) -> bool:
+        """Check whether the file storage flashcards were already imported."""
+        return (
+            self._conn.execute("PRAGMA user_version").fetchone()[0] >= _IMPORTED_VERSION
+        )
+
+    def _import_file_flashcards(self):
+        """
+        Copy flashcards from the file storage formats into the database once.
+
+        The import is marked done with PRAGMA user_version in the same
+        transaction that inserts the cards, so it either happens completely
+        or is retried on the next start. BEGIN IMMEDIATE makes workers
+        starting together take turns, and the loser finds the marker set.
+        """
+        if self._imported():
+            return
+
+        # Validate everything before writing, so bad data fails the start
+        # without leaving a half-imported database behind
+        rows, source = self._read_file_flashcards()
+
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            if not self._imported():
+                # A database created before the marker existed already holds the import
+                empty = (
+                    self._conn.execute("SELECT 1 FROM flashcards LIMIT 1").fetchone()
+                    is None
+                )
+                if empty and rows:
+                    self._conn.executemany(
+                        f"INSERT OR IGNORE INTO flashcards ({_COLUMNS}) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                    logger.info("Imported %s flashcards from %s", len(rows), source)
+                self._conn.execute(f"PRAGMA user_version = {_IMPORTED_VERSION}")
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _read_file_flashcards(self) -> Tuple[List[tuple], Optional[Path]]:
+        """
+        Read and validate the flashcards kept by the file storage service.
+
+        Returns:
+            Tuple of (database rows, file they were read from or None)
+        """
+        log_file = self.data_dir / "flashcards.jsonl"
+        legacy_file = self.data_dir / "flashcards.json"
+        cards: Dict[str, Dict[str, Any]] = {}
+        if log_file.exists():
+            _replay_lines(cards, log_file.read_bytes().split(b"\n"), log_file)
+            source = log_file
+        elif legacy_file.exists():
+            try:
+                legacy_data = orjson.loads(legacy_file.read_bytes())
+            except orjson.JSONDecodeError as e:
+                logger.error("Error loading %s: %s", legacy_file, e)
+                return [], None
+            cards = {card["id"]: card for card in legacy_data}
+            source = legacy_file
+        else:
+            return [], None
+
+        rows = []
+        for card in cards.values():
+            fields = dict(card)
+            for field in ("created_at", "updated_at"):
+                if isinstance(fields.get(field), int):
+                    fields[field] = _from_epoch_ns(fields[field])
+            rows.append(self._to_row(Flashcard(**fields)))
+        return rows, source
+
+    @staticmethod
+    def _to_row(flashcard: Flashcard) -> tuple:
+        """Convert a flashcard to a database row."""
+        return (
+            flashcard.id,
+            flashcard.front,
+            flashcard.back,
+            _to_epoch_ns(flashcard.created_at),
+            _to_epoch_ns(flashcard.updated_at),
+            flashcard.study_count,
+            flashcard.correct_count,
+        )
+
+    @staticmethod
+    def _from_row(row: tuple) -> Flashcard:
+        """Convert a database row to a flashcard."""
+        return Flashcard(
+            id=row[0],
+            front=row[1],
+            back=row[2],
+            created_at=_from_epoch_ns(row[3]),
+            updated_at=_from_epoch_ns(row[4]),
+            study_count=row[5],
+            correct_count=row[6],
+        )
+
+    async def _run(self, operation: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run a database operation in a worker thread."""
+
+        def locked():
+            with self._db_lock:
+                return operation(self._conn)
+
+        return await asyncio.to_thread(locked)
+
+    # Flashcard operations
+
+    async def create_flashcard(self, flashcard: Flashcard) -> Flashcard:
+        """Create a new flashcard."""
+        row = self._to_row(flashcard)
+        await self._run(
+            lambda conn: conn.execute(
+                f"INSERT INTO flashcards ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)", row
+            )
+        )
+
+        logger.info("Created flashcard %s", flashcard.id)
+        return flashcard
+
+    async def create_flashcards(self, flashcards: List[Flashcard]) -> List[Flashcard]:
+        """Create several flashcards in a single transaction."""
+        rows = [self._to_row(flashcard) for flashcard in flashcards]
+
+        def insert(conn):
+            with conn:
+                conn.executemany(
+                    f"INSERT INTO flashcards ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+
+        await self._run(insert)
+        logger.info("Created %s flashcards", len(flashcards))
+        return flashcards
+
+    async def get_flashcard(self, flashcard_id: str) -> Optional[Flashcard]:
+        """Get a flashcard by ID."""
+        row = await self._run(
+            lambda conn: conn.execute(
+                f"SELECT {_COLUMNS} FROM flashcards WHERE id = ?", (flashcard_id,)
+            ).fetchone()
+        )
+        return self._from_row(row) if row is not None else None
+
+    async def get_all_flashcards(self) -> List[Flashcard]:
+        """Get all flashcards in creation order."""
+        rows = await self._run(
+            lambda conn: conn.execute(
+                f"SELECT {_COLUMNS} FROM flashcards ORDER BY rowid"
+            ).fetchall()
+        )
+        return [self._from_row(row) for row in rows]
+
+    async def update_flashcard(self, flashcard: Flashcard) -> Flashcard:
+        """Update an existing flashcard."""
+
+        def update(conn: sqlite3.Connection) -> bool:
+            # Check the row first so a missing ID leaves the flashcard untouched
+            if (
+                conn.execute(
+                    "SELECT 1 FROM flashcards WHERE id = ?", (flashcard.id,)
+                ).fetchone()
+                is None
+            ):
+                return False
+            flashcard.touch()
+            row = self._to_row(flashcard)
+            conn.execute(
+                "UPDATE flashcards SET front = ?, back = ?, created_at = ?, "
+                "updated_at = ?, study_count = ?, correct_count = ? WHERE id = ?",
+                row[1:] + row[:1],
+            )
+            return True
+
+        if not await self._run(update):
+            raise FlashcardNotFound(flashcard.id)
+
+        logger.info("Updated flashcard %s", flashcard.id)
+        return flashcard
+
+    async def delete_flashcard(self, flashcard_id: str) -> bool:
+        """Delete a flashcard by ID."""
+        cursor = await self._run(
+            lambda conn: conn.execute(
+                "DELETE FROM flashcards WHERE id = ?", (flashcard_id,)
+            )
+        )
+        if cursor.rowcount == 0:
+            return False
+
+        logger.info("Deleted flashcard %s", flashcard_id)
+        return True
+
+    def get_flashcards_mtime(self) -> int:
+        """
+        Get the latest modification time of the database in nanoseconds.
+
+        In WAL mode commits land in the -wal file first, so both files count.
+        """
+        mtimes = [0]
+        for path in (self.db_file, self.db_file.with_name(self.db_file.name + "-wal")):
+            try:
+                mtimes.append(path.stat().st_mtime_ns)
+            except FileNotFoundError:
+                pass
+        return max(mtimes)
+
+    async def get_flashcards_count(self) -> int:
+        """Get the total number of flashcards."""
+        row = await self._run(
+            lambda conn: conn.execute("SELECT COUNT(*) FROM flashcards").fetchone()
+        )
+        return row[0]
+
+    async def compact_flashcards(self):
+        """Fold the write-ahead log back into the database file."""
+        await self._run(lambda conn: conn.execute("PRAGMA wal_checkpoint(TRUNCATE)"))
+
+    def close(self):
+        """Close the database connection."""
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,101 @@
+"""
+Shared pytest fixtures.
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api.flashcard_routes import get_flashcard_service
+from src.main import create_app
+from src.models.flashcard import Flashcard
+from src.services.flashcard_service import FlashcardService
+from src.storage.file_storage import FileStorageService
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """One event loop for the whole run, shared by session-scoped async fixtures."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def app_instance():
+    """App built for this test run, so each xdist worker has its own."""
+    return create_app()
+
+
+@pytest.fixture(scope="session")
+async def client(app_instance):
+    """Async client calling the app in-process, shared by every API test in the run."""
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app_instance),
+        base_url="http://localhost",
+        follow_redirects=True,
+    ) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def sync_client(app_instance):
+    """Synchronous test client, for callers that can't await such as benchmarks."""
+    return TestClient(app_instance, base_url="http://localhost")
+
+
+@pytest.fixture
+def tmp_storage(tmp_path):
+    """Storage service backed by the test's own temporary directory."""
+    return FileStorageService(str(tmp_path))
+
+
+@pytest.fixture
+def override_storage(app_instance, tmp_storage):
+    """Route API requests to the per-test storage."""
+    app_instance.dependency_overrides[get_flashcard_service] = lambda: FlashcardService(
+        tmp_storage
+    )
+    yield tmp_storage
+    app_instance.dependency_overrides.clear()
+
+
+@pytest.fixture
+def client_with_storage(client, override_storage):
+    """Async client whose requests are served from the per-test storage."""
+    return client
+
+
+@pytest.fixture
+def mock_service():
+    """Flashcard service mock for tests that never reach storage."""
+    return MagicMock(spec=FlashcardService)
+
+
+@pytest.fixture
+def client_with_mock(app_instance, client, mock_service):
+    """Async client whose requests are served by the service mock."""
+    app_instance.dependency_overrides[get_flashcard_service] = lambda: mock_service
+    yield client
+    app_instance.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="module")
+def flashcard_factory():
+    """Build flashcards with default content, overridable per call."""
+
+    def make(**overrides):
+        return Flashcard(
+            front=overrides.get("front", "Test"), back=overrides.get("back", "Prueba")
+        )
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def default_flashcard():
+    """Flashcard shared by tests that only need a storage return value."""
+    return Flashcard(front="Test", back="Prueba")
@@ -0,0 +1,358 @@
+"""
+Unit tests for FileStorageService flashcard persistence.
+"""
+
+import asyncio
+import json
+import os
+
+import pytest
+
+from src.models.flashcard import Flashcard
+from src.models.study_session import StudySession
+from src.storage.base import FlashcardNotFound
+from src.storage.file_storage import FileStorageService
+
+
+@pytest.fixture
+def storage(tmp_storage):
+    """Storage service backed by the test's temporary directory."""
+    return tmp_storage
+
+
+class TestFlashcardLog:
+    """Test suite for the append-only flashcards log."""
+
+    async def test_mutations_append_records(self, storage):
+        """Test that create/update/delete append instead of rewriting."""
+        flashcard = await storage.create_flashcard(
+            Flashcard(front="Hello", back="Hola")
+        )
+        flashcard.back = "Buenas"
+        await storage.update_flashcard(flashcard)
+        await storage.delete_flashcard(flashcard.id)
+
+        lines = storage.flashcards_file.read_bytes().splitlines()
+        assert [json.loads(line)["op"] for line in lines] == ["put", "put", "del"]
+        assert await storage.get_all_flashcards() == []
+
+    async def test_replay_keeps_latest_version_in_creation_order(self, storage):
+        """Test that later records override earlier ones without reordering."""
+        first = await storage.create_flashcard(Flashcard(front="One", back="Uno"))
+        second = await storage.create_flashcard(Flashcard(front="Two", back="Dos"))
+        first.back = "Una"
+        await storage.update_flashcard(first)
+
+        flashcards = await storage.get_all_flashcards()
+        assert [fc.id for fc in flashcards] == [first.id, second.id]
+        assert flashcards[0].back == "Una"
+        assert (await storage.get_flashcard(second.id)).front == "Two"
+
+    async def test_create_flashcards_appends_batch(self, storage):
+        """Test that a bulk create lands as one put record per card."""
+        batch = [Flashcard(front=f"Card {i}", back=f"Tarjeta {i}") for i in range(3)]
+        await storage.create_flashcards(batch)
+
+        assert len(storage.flashcards_file.read_bytes().splitlines()) == 3
+        assert [fc.id for fc in await storage.get_all_flashcards()] == [
+            fc.id for fc in batch
+        ]
+
+    async def test_timestamps_stored_as_epoch_nanoseconds(self, storage):
+        """Test that timestamps are written as integers and read back unchanged."""
+        flashcard = await storage.create_flashcard(
+            Flashcard(front="Hello", back="Hola")
+        )
+
+        card = json.loads(storage.flashcards_file.read_bytes().splitlines()[0])["card"]
+        assert isinstance(card["created_at"], int)
+        assert isinstance(card["updated_at"], int)
+
+        loaded = (await FileStorageService(str(storage.data_dir)).get_all_flashcards())[
+            0
+        ]
+        assert loaded.created_at == flashcard.created_at
+        assert loaded.updated_at_iso == flashcard.updated_at_iso
+
+    async def test_update_and_delete_missing_flashcard(self, storage):
+        """Test not-found handling for update and delete."""
+        with pytest.raises(FlashcardNotFound):
+            await storage.update_flashcard(Flashcard(front="Ghost", back="Fantasma"))
+        assert await storage.delete_flashcard("missing") is False
+
+    async def test_compact_flashcards(self, storage):
+        """Test that compaction leaves one record per live card."""
+        keep = await storage.create_flashcard(Flashcard(front="Keep", back="Guardar"))
+        drop = await storage.create_flashcard(Flashcard(front="Drop", back="Soltar"))
+        await storage.delete_flashcard(drop.id)
+
+        await storage.compact_flashcards()
+
+        lines = storage.flashcards_file.read_bytes().splitlines()
+        assert len(lines) == 1
+        assert [fc.id for fc in await storage.get_all_flashcards()] == [keep.id]
+
+    async def test_replay_across_read_chunks(self, storage):
+        """Test that records split across read chunks are reassembled."""
+        batch = [Flashcard(front=f"Card {i}", back=f"Tarjeta {i}") for i in range(20)]
+        await storage.create_flashcards(batch)
+        await storage.delete_flashcard(batch[3].id)
+
+        reader = FileStorageService(str(storage.data_dir))
+        reader.READ_CHUNK_SIZE = 7
+        flashcards = await reader.get_all_flashcards()
+
+        assert [fc.id for fc in flashcards] == [
+            fc.id for i, fc in enumerate(batch) if i != 3
+        ]
+
+    async def test_skips_torn_trailing_record(self, storage):
+        """Test that a partially written last line is ignored."""
+        flashcard = await storage.create_flashcard(
+            Flashcard(front="Hello", back="Hola")
+        )
+        with open(storage.flashcards_file, "ab") as f:
+            f.write(b'{"op": "put", "card": {"id"')
+
+        assert [fc.id for fc in await storage.get_all_flashcards()] == [flashcard.id]
+
+    def test_migrates_legacy_json_file(self, tmp_path):
+        """Test that an existing flashcards.json array is imported into the log."""
+        legacy = Flashcard(front="Old", back="Viejo")
+        (tmp_path / "flashcards.json").write_text(
+            json.dumps([legacy.model_dump()], default=str), encoding="utf-8"
+        )
+
+        storage = FileStorageService(str(tmp_path))
+
+        lines = storage.flashcards_file.read_bytes().splitlines()
+        assert json.loads(lines[0])["card"]["id"] == legacy.id
+
+    async def test_concurrent_update_and_delete_do_not_resurrect(self, storage):
+        """Test that an update racing a delete can't re-create the card."""
+        flashcard = await storage.create_flashcard(
+            Flashcard(front="Hello", back="Hola")
+        )
+
+        results = await asyncio.gather(
+            storage.delete_flashcard(flashcard.id),
+            storage.update_flashcard(flashcard),
+            return_exceptions=True,
+        )
+
+        assert results[0] is True
+        assert isinstance(results[1], ValueError)
+        assert await storage.get_all_flashcards() == []
+
+
+class TestStorageCache:
+    """Test suite for the mtime/size keyed read cache."""
+
+    async def test_unchanged_file_is_not_reread(self, storage, monkeypatch):
+        """Test that reads of an unchanged log are served from memory."""
+        flashcard = await storage.create_flashcard(
+            Flashcard(front="Hello", back="Hola")
+        )
+        await storage.get_all_flashcards()
+
+        def fail_open(*args, **kwargs):
+            raise AssertionError("file should not be reread")
+
+        monkeypatch.setattr("src.storage.file_storage.aiofiles.open", fail_open)
+        assert [fc.id for fc in await storage.get_all_flashcards()] == [flashcard.id]
+
+    async def test_own_appends_update_cache(self, storage):
+        """Test that appends from this instance are folded into the cache."""
+        await storage.get_all_flashcards()
+        flashcard = await storage.create_flashcard(
+            Flashcard(front="Hello", back="Hola")
+        )
+
+        assert (
+            storage._get_cached(
+                storage.flashcards_file,
+                storage._file_signature(storage.flashcards_file),
+            )
+            is not None
+        )
+        assert (await storage.get_flashcard(flashcard.id)).front == "Hello"
+
+    async def test_external_write_invalidates_cache(self, storage, tmp_path):
+        """Test that a change made by another process is picked up."""
+        await storage.create_flashcard(Flashcard(front="Mine", back="Mio"))
+        await storage.get_all_flashcards()
+
+        other = FileStorageService(str(tmp_path))
+        theirs = await other.create_flashcard(Flashcard(front="Theirs", back="Suyo"))
+
+        assert theirs.id in [fc.id for fc in await storage.get_all_flashcards()]
+
+    async def test_reads_validate_each_card_once(self, storage, monkeypatch):
+        """Test that repeated reads copy the validated model instead of rebuilding."""
+        flashcard = await storage.create_flashcard(
+            Flashcard(front="Hello", back="Hola")
+        )
+        await storage.get_flashcard(flashcard.id)
+
+        monkeypatch.setattr("src.storage.file_storage.Flashcard", None)
+        copy = await storage.get_flashcard(flashcard.id)
+        copy.back = "Buenas"
+
+        assert copy.id == flashcard.id
+        assert (await storage.get_all_flashcards())[0].back == "Hola"
+
+
+class TestStudySessionStorage:
+    """Test suite for per-file study session persistence."""
+
+    @pytest.fixture
+    def flashcards(self):
+        """Create flashcards to build sessions from."""
+        return [
+            Flashcard(front="Hello", back="Hola"),
+            Flashcard(front="Bye", back="Adios"),
+        ]
+
+    async def test_create_get_and_update_session(self, storage, flashcards):
+        """Test that sessions are found by ID after create and update."""
+        first = await storage.create_study_session(
+            StudySession.create_session(flashcards)
+        )
+        second = await storage.create_study_session(
+            StudySession.create_session(flashcards)
+        )
+
+        second.current_index = 1
+        await storage.update_study_session(second)
+
+        assert (await storage.get_study_session(first.session_id)).current_index == 0
+        assert (await storage.get_study_session(second.session_id)).current_index == 1
+        assert await storage.get_study_session("missing") is None
+
+    async def test_each_session_has_its_own_file(self, storage, flashcards):
+        """Test that saving a session writes only that session's file."""
+        first = await storage.create_study_session(
+            StudySession.create_session(flashcards)
+        )
+        second = await storage.create_study_session(
+            StudySession.create_session(flashcards)
+        )
+        first_bytes = (storage.sessions_dir / f"{first.session_id}.json").read_bytes()
+
+        second.current_index = 1
+        await storage.update_study_session(second)
+
+        assert sorted(p.name for p in storage.sessions_dir.iterdir()) == sorted(
+            [f"{first.session_id}.json", f"{second.session_id}.json"]
+        )
+        assert (
+            storage.sessions_dir / f"{first.session_id}.json"
+        ).read_bytes() == first_bytes
+        assert await storage.get_sessions_count() == 2
+
+    async def test_recent_sessions_ordered_by_last_save(self, storage, flashcards):
+        """Test that recent sessions come newest-saved first and honour the limit."""
+        sessions = [
+            await storage.create_study_session(StudySession.create_session(flashcards))
+            for _ in range(3)
+        ]
+        for i, session in enumerate(sessions):
+            mtime_ns = (1_700_000_000 + i) * 1_000_000_000
+            os.utime(
+                storage.sessions_dir / f"{session.session_id}.json",
+                ns=(mtime_ns, mtime_ns),
+            )
+
+        recent = await storage.get_recent_sessions(limit=2)
+
+        assert [s.session_id for s in recent] == [
+            sessions[2].session_id,
+            sessions[1].session_id,
+        ]
+
+    async def test_sessions_count_follows_directory(
+        self, storage, flashcards, tmp_path
+    ):
+        """Test that the cached session count notices sessions added by others."""
+        await storage.create_study_session(StudySession.create_session(flashcards))
+        settled_ns = (1_700_000_000) * 1_000_000_000
+        os.utime(storage.sessions_dir, ns=(settled_ns, settled_ns))
+        assert await storage.get_sessions_count() == 1
+        assert storage._sessions_count == (settled_ns, 1)
+
+        other = FileStorageService(str(tmp_path))
+        await other.create_study_session(StudySession.create_session(flashcards))
+
+        assert await storage.get_sessions_count() == 2
+
+    async def test_rejects_unsafe_session_ids(self, storage):
+        """Test that IDs which aren't plain file names never reach the filesystem."""
+        assert await storage.get_study_session("../flashcards") is None
+        assert await storage.get_study_session("") is None
+
+    async def test_update_missing_session(self, storage, flashcards):
+        """Test that updating an unknown session raises."""
+        with pytest.raises(ValueError, match="not found"):
+            await storage.update_study_session(StudySession.create_session(flashcards))
+
+    async def test_sees_sessions_from_other_instances(
+        self, storage, flashcards, tmp_path
+    ):
+        """Test that a session written by another instance is found."""
+        await storage.create_study_session(StudySession.create_session(flashcards))
+
+        other = FileStorageService(str(tmp_path))
+        theirs = await other.create_study_session(
+            StudySession.create_session(flashcards)
+        )
+
+        assert (
+            await storage.get_study_session(theirs.session_id)
+        ).session_id == theirs.session_id
+
+    async def test_concurrent_creates_are_all_kept(self, storage, flashcards):
+        """Test that concurrently created sessions are all kept."""
+        sessions = [StudySession.create_session(flashcards) for _ in range(5)]
+
+        await asyncio.gather(
+            *(storage.create_study_session(session) for session in sessions)
+        )
+
+        for session in sessions:
+            assert await storage.get_study_session(session.session_id) is not None
+
+    async def test_failed_save_keeps_previous_file(
+        self, storage, flashcards, monkeypatch
+    ):
+        """Test that a save interrupted before the rename leaves the old file intact."""
+        session = await storage.create_study_session(
+            StudySession.create_session(flashcards)
+        )
+        session_file = storage.sessions_dir / f"{session.session_id}.json"
+        before = session_file.read_bytes()
+
+        async def fail_replace(*args, **kwargs):
+            raise OSError("disk went away")
+
+        monkeypatch.setattr(
+            "src.storage.file_storage.aiofiles.os.replace", fail_replace
+        )
+        session.current_index = 1
+        with pytest.raises(OSError):
+            await storage.update_study_session(session)
+
+        assert session_file.read_bytes() == before
+        assert list(storage.sessions_dir.glob("*.tmp")) == []
+
+    def test_migrates_legacy_sessions_file(self, tmp_path, flashcards):
+        """Test that an existing study_sessions.json is split into per-session files."""
+        legacy = StudySession.create_session(flashcards)
+        (tmp_path / "study_sessions.json").write_text(
+            json.dumps([legacy.model_dump()], default=str), encoding="utf-8"
+        )
+
+        storage = FileStorageService(str(tmp_path))
+
+        assert [p.name for p in storage.sessions_dir.iterdir()] == [
+            f"{legacy.session_id}.json"
+        ]
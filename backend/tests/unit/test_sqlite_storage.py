@@ -0,0 +1,159 @@
+"""
+Unit tests for SQLiteStorageService flashcard persistence.
+"""
+
+import orjson
+import pytest
+
+from src.models.flashcard import Flashcard
+from src.models.study_session import StudySession
+from src.storage.base import FlashcardNotFound
+from src.storage.factory import create_storage_service
+from src.storage.file_storage import FileStorageService
+from src.storage.sqlite_storage import SQLiteStorageService
+
+
+class TestSQLiteFlashcards:
+    """Test suite for flashcards stored in SQLite."""
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        """Create a SQLite storage service backed by a temporary directory."""
+        service = SQLiteStorageService(str(tmp_path))
+        yield service
+        service.close()
+
+    async def test_crud_round_trip(self, storage):
+        """Test create, read, update and delete against the database."""
+        first = await storage.create_flashcard(Flashcard(front="One", back="Uno"))
+        second = await storage.create_flashcard(Flashcard(front="Two", back="Dos"))
+
+        first.back = "Una"
+        await storage.update_flashcard(first)
+        assert await storage.delete_flashcard(second.id) is True
+
+        flashcards = await storage.get_all_flashcards()
+        assert [(fc.id, fc.back) for fc in flashcards] == [(first.id, "Una")]
+        loaded = await storage.get_flashcard(first.id)
+        assert loaded.created_at == first.created_at
+        assert loaded.updated_at == first.updated_at
+        assert await storage.get_flashcards_count() == 1
+
+    async def test_update_and_delete_missing_flashcard(self, storage):
+        """Test not-found handling for update and delete."""
+        ghost = Flashcard(front="Ghost", back="Fantasma")
+        updated_at = ghost.updated_at
+        with pytest.raises(FlashcardNotFound):
+            await storage.update_flashcard(ghost)
+        assert ghost.updated_at == updated_at
+        assert await storage.delete_flashcard("missing") is False
+        assert await storage.get_flashcard("missing") is None
+
+    async def test_create_flashcards_keeps_order(self, storage):
+        """Test that a bulk insert is read back in creation order."""
+        batch = [Flashcard(front=f"Card {i}", back=f"Tarjeta {i}") for i in range(5)]
+        await storage.create_flashcards(batch)
+
+        assert [fc.id for fc in await storage.get_all_flashcards()] == [
+            fc.id for fc in batch
+        ]
+
+    async def test_writes_change_mtime(self, storage):
+        """Test that the service cache sees database writes as file changes."""
+        before = storage.get_flashcards_mtime()
+        await storage.create_flashcard(Flashcard(front="Hello", back="Hola"))
+
+        assert storage.get_flashcards_mtime() >= before > 0
+
+    async def test_sessions_use_files(self, storage):
+        """Test that study sessions still work alongside the database."""
+        flashcard = await storage.create_flashcard(
+            Flashcard(front="Hello", back="Hola")
+        )
+        session = await storage.create_study_session(
+            StudySession.create_session([flashcard])
+        )
+
+        assert (await storage.get_study_session(session.session_id)).flashcard_ids == [
+            flashcard.id
+        ]
+
+    async def test_imports_existing_flashcards_log(self, tmp_path):
+        """Test that cards from the file backend are copied into a new database."""
+        file_storage = FileStorageService(str(tmp_path))
+        kept = await file_storage.create_flashcard(
+            Flashcard(front="Keep", back="Guardar")
+        )
+        dropped = await file_storage.create_flashcard(
+            Flashcard(front="Drop", back="Soltar")
+        )
+        await file_storage.delete_flashcard(dropped.id)
+
+        storage = SQLiteStorageService(str(tmp_path))
+        try:
+            flashcards = await storage.get_all_flashcards()
+        finally:
+            storage.close()
+
+        assert [(fc.id, fc.created_at) for fc in flashcards] == [
+            (kept.id, kept.created_at)
+        ]
+
+    async def test_imports_only_once(self, tmp_path):
+        """Test that cards deleted after the import don't come back on restart."""
+        card = await FileStorageService(str(tmp_path)).create_flashcard(
+            Flashcard(front="Hello", back="Hola")
+        )
+        storage = SQLiteStorageService(str(tmp_path))
+        await storage.delete_flashcard(card.id)
+        storage.close()
+
+        storage = SQLiteStorageService(str(tmp_path))
+        try:
+            assert await storage.get_all_flashcards() == []
+        finally:
+            storage.close()
+
+    async def test_failed_import_is_retried(self, tmp_path):
+        """Test that invalid legacy data fails the start without marking the import."""
+        legacy_file = tmp_path / "flashcards.json"
+        card = {"id": "1", "front": "Hello", "back": "Hola"}
+        legacy_file.write_bytes(orjson.dumps([{**card, "front": ""}]))
+
+        with pytest.raises(ValueError):
+            SQLiteStorageService(str(tmp_path))
+
+        legacy_file.write_bytes(orjson.dumps([card]))
+        storage = SQLiteStorageService(str(tmp_path))
+        try:
+            assert [fc.id for fc in await storage.get_all_flashcards()] == ["1"]
+        finally:
+            storage.close()
+
+
+class TestStorageFactory:
+    """Test suite for STORAGE_BACKEND selection."""
+
+    @pytest.mark.parametrize(
+        "backend, expected",
+        [
+            (None, FileStorageService),
+            ("file", FileStorageService),
+            ("SQLite", SQLiteStorageService),
+        ],
+    )
+    def test_selects_backend(self, tmp_path, monkeypatch, backend, expected):
+        """Test that the environment variable picks the storage class."""
+        if backend is None:
+            monkeypatch.delenv("STORAGE_BACKEND", raising=False)
+        else:
+            monkeypatch.setenv("STORAGE_BACKEND", backend)
+
+        assert type(create_storage_service(str(tmp_path))) is expected
+
+    def test_rejects_unknown_backend(self, tmp_path, monkeypatch):
+        """Test that a typo in the backend name fails loudly."""
+        monkeypatch.setenv("STORAGE_BACKEND", "postgres")
+
+        with pytest.raises(ValueError, match="STORAGE_BACKEND"):
+            create_storage_service(str(tmp_path))
@@ -2,23 +2,27 @@
 Simple MVP test server for development
 """
 
+import sys
+import uuid
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List
+
+import uvicorn
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
-import json
-import os
-from pathlib import Path
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import List
-import uuid
-from datetime import datetime
 
-app = FastAPI(title="Flashcard MVP", version="1.0.0")
+app = FastAPI(
+    title="Flashcard MVP", version="1.0.0", default_response_class=ORJSONResponse
+)
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://127.0.0.1:3000", "http://localhost:8080"],
+    allow_origin_regex=r"^http://(localhost|127\.0\.0\.1):(3000|8080)$",
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE"],
     allow_headers=["*"],
@@ -26,13 +30,20 @@ app.add_middleware(
 
 # Simple in-memory storage for testing
 flashcards_data = []
-study_sessions = {}
+# Flashcards by ID, kept in step with flashcards_data for O(1) lookups
+flashcards_index: Dict[str, "Flashcard"] = {}
+# Sessions in least- to most-recently used order; the oldest are evicted
+# once MAX_SESSIONS is exceeded so a long-running server stays bounded
+MAX_SESSIONS = 10_000
+study_sessions: "OrderedDict[str, dict]" = OrderedDict()
+
 
 class FlashcardCreate(BaseModel):
     front: str
     back: str
     tags: List[str] = []
 
+
 class Flashcard(BaseModel):
     id: str
     front: str
@@ -41,13 +52,16 @@ class Flashcard(BaseModel):
     created_at: str
     updated_at: str
 
+
 class StudySessionCreate(BaseModel):
     pass  # No parameters needed for creating a session
 
+
 class StudyResponse(BaseModel):
     is_correct: bool
     response_time_seconds: float = 1.0
 
+
 class StudySession(BaseModel):
     session_id: str
     total_cards: int
@@ -55,153 +69,177 @@ class StudySession(BaseModel):
     is_complete: bool
     progress: dict
 
+
 @app.get("/")
 async def root():
     return {"message": "Flashcard MVP API", "status": "running"}
 
+
 @app.get("/health")
 async def health():
     return {"status": "healthy", "flashcards_count": len(flashcards_data)}
 
-@app.get("/api/flashcards", response_model=List[Flashcard])
-async def list_flashcards():
+
+# Flashcards are validated once on creation; response_model=None skips
+# re-validating them on the way out while keeping the return annotation
+
+
+@app.get("/api/flashcards", response_model=None)
+async def list_flashcards() -> List[Flashcard]:
     return flashcards_data
 
+
 @app.post("/api/flashcards", response_model=Flashcard)
 async def create_flashcard(flashcard: FlashcardCreate):
     now = datetime.now().isoformat()
     new_flashcard = Flashcard(
-        id=str(uuid.uuid4()),
+        id=uuid.uuid4().hex,
         front=flashcard.front,
         back=flashcard.back,
         tags=flashcard.tags,
         created_at=now,
-        updated_at=now
+        updated_at=now,
     )
     flashcards_data.append(new_flashcard)
+    flashcards_index[new_flashcard.id] = new_flashcard
     return new_flashcard
 
-@app.get("/api/flashcards/{flashcard_id}", response_model=Flashcard)
-async def get_flashcard(flashcard_id: str):
-    for flashcard in flashcards_data:
-        if flashcard.id == flashcard_id:
-            return flashcard
-    raise HTTPException(status_code=404, detail="Flashcard not found")
+
+@app.get("/api/flashcards/{flashcard_id}", response_model=None)
+async def get_flashcard(flashcard_id: str) -> Flashcard:
+    flashcard = flashcards_index.get(flashcard_id)
+    if flashcard is None:
+        raise HTTPException(status_code=404, detail="Flashcard not found")
+    return flashcard
+
 
 # Study Session Endpoints
 
-@app.post("/api/study/start", response_model=StudySession)
-async def start_study_session():
+
+def get_session(session_id: str) -> dict:
+    """Look up a study session and mark it as recently used."""
+    session = study_sessions.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Study session not found")
+    study_sessions.move_to_end(session_id)
+    return session
+
+
+def session_state(session: dict) -> StudySession:
+    """Build the session state and progress response from a stored session."""
+    correct_count = session["correct_count"]
+    incorrect_count = session["incorrect_count"]
+    answered = correct_count + incorrect_count
+    accuracy = (correct_count / answered * 100) if answered else 0.0
+
+    return StudySession(
+        session_id=session["session_id"],
+        total_cards=session["total_cards"],
+        current_index=session["current_index"],
+        is_complete=session["is_complete"],
+        progress={
+            "current_card": session["current_index"] + 1,
+            "total_cards": session["total_cards"],
+            "cards_completed": answered,
+            "correct_responses": correct_count,
+            "incorrect_responses": incorrect_count,
+            "accuracy_percentage": accuracy,
+        },
+    )
+
+
+# Both session state endpoints build a validated StudySession themselves, so
+# response_model=None skips validating it a second time on the way out
+
+
+@app.post("/api/study/start", response_model=None)
+async def start_study_session() -> StudySession:
     """Start a new study session with all available flashcards."""
     if not flashcards_data:
         raise HTTPException(status_code=400, detail="No flashcards available for study")
-    
-    session_id = str(uuid.uuid4())
+
+    session_id = uuid.uuid4().hex
     session_data = {
         "session_id": session_id,
-        "flashcard_ids": [fc.id for fc in flashcards_data],
+        # Cards in study order, so endpoints fetch the current one by position
+        "flashcards": list(flashcards_data),
+        "total_cards": len(flashcards_data),
         "current_index": 0,
-        "responses": [],
-        "started_at": datetime.now().isoformat()
+        "is_complete": False,
+        # Responses as parallel arrays, one entry per answered card in
+        # study order; the card for entry i is flashcards[i]
+        "is_correct": [],
+        "response_times": array("f"),
+        "correct_count": 0,
+        "incorrect_count": 0,
+        "started_at": datetime.now().isoformat(),
     }
     study_sessions[session_id] = session_data
-    
-    return StudySession(
-        session_id=session_id,
-        total_cards=len(flashcards_data),
-        current_index=0,
-        is_complete=False,
-        progress={
-            "current_card": 1,
-            "total_cards": len(flashcards_data),
-            "cards_completed": 0,
-            "correct_responses": 0,
-            "incorrect_responses": 0,
-            "accuracy_percentage": 0.0
-        }
-    )
+    if len(study_sessions) > MAX_SESSIONS:
+        study_sessions.popitem(last=False)
 
-@app.get("/api/study/{session_id}/current", response_model=Flashcard)
-async def get_current_flashcard(session_id: str):
+    return session_state(session_data)
+
+
+@app.get("/api/study/{session_id}/current", response_model=None)
+async def get_current_flashcard(session_id: str) -> Flashcard:
     """Get the current flashcard in the study session."""
-    if session_id not in study_sessions:
-        raise HTTPException(status_code=404, detail="Study session not found")
-    
-    session = study_sessions[session_id]
-    if session["current_index"] >= len(session["flashcard_ids"]):
+    session = get_session(session_id)
+    if session["is_complete"]:
         raise HTTPException(status_code=400, detail="Study session is complete")
-    
-    current_flashcard_id = session["flashcard_ids"][session["current_index"]]
-    for flashcard in flashcards_data:
-        if flashcard.id == current_flashcard_id:
-            return flashcard
-    
-    raise HTTPException(status_code=404, detail="Current flashcard not found")
+
+    return session["flashcards"][session["current_index"]]
+
 
 @app.post("/api/study/{session_id}/respond")
 async def submit_response(session_id: str, response: StudyResponse):
     """Submit a response to the current flashcard and advance to next."""
-    if session_id not in study_sessions:
-        raise HTTPException(status_code=404, detail="Study session not found")
-    
-    session = study_sessions[session_id]
-    if session["current_index"] >= len(session["flashcard_ids"]):
+    session = get_session(session_id)
+    if session["is_complete"]:
         raise HTTPException(status_code=400, detail="Study session is already complete")
-    
+
     # Record the response
-    current_flashcard_id = session["flashcard_ids"][session["current_index"]]
-    session["responses"].append({
-        "flashcard_id": current_flashcard_id,
-        "is_correct": response.is_correct,
-        "response_time_seconds": response.response_time_seconds,
-        "timestamp": datetime.now().isoformat()
-    })
-    
+    session["is_correct"].append(response.is_correct)
+    session["response_times"].append(response.response_time_seconds)
+    # Keep running totals so progress checks don't rescan the responses
+    if response.is_correct:
+        session["correct_count"] += 1
+    else:
+        session["incorrect_count"] += 1
+
     # Advance to next card
     session["current_index"] += 1
-    
+    if session["current_index"] >= session["total_cards"]:
+        session["is_complete"] = True
+
     return {"message": "Response recorded", "advanced": True}
 
-@app.get("/api/study/{session_id}/progress", response_model=StudySession)
-async def get_study_progress(session_id: str):
+
+@app.get("/api/study/{session_id}/progress", response_model=None)
+async def get_study_progress(session_id: str) -> StudySession:
     """Get the current progress of the study session."""
-    if session_id not in study_sessions:
-        raise HTTPException(status_code=404, detail="Study session not found")
-    
-    session = study_sessions[session_id]
-    
-    # Calculate progress statistics
-    correct_count = sum(1 for r in session["responses"] if r["is_correct"])
-    incorrect_count = len(session["responses"]) - correct_count
-    accuracy = (correct_count / len(session["responses"]) * 100) if session["responses"] else 0.0
-    
-    is_complete = session["current_index"] >= len(session["flashcard_ids"])
-    
-    return StudySession(
-        session_id=session_id,
-        total_cards=len(session["flashcard_ids"]),
-        current_index=session["current_index"],
-        is_complete=is_complete,
-        progress={
-            "current_card": session["current_index"] + 1,
-            "total_cards": len(session["flashcard_ids"]),
-            "cards_completed": len(session["responses"]),
-            "correct_responses": correct_count,
-            "incorrect_responses": incorrect_count,
-            "accuracy_percentage": accuracy
-        }
-    )
+    session = get_session(session_id)
+
+    return session_state(session)
+
 
 @app.post("/api/study/{session_id}/complete")
 async def complete_study_session(session_id: str):
     """Mark the study session as completed."""
-    if session_id not in study_sessions:
-        raise HTTPException(status_code=404, detail="Study session not found")
-    
-    session = study_sessions[session_id]
+    session = get_session(session_id)
     session["completed_at"] = datetime.now().isoformat()
-    
+
     return {"message": "Study session completed", "session_id": session_id}
 
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # reload needs the app as an import string rather than the instance
+    uvicorn.run(
+        "simple_server:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=True,
+        # uvloop has no Windows build; "auto" falls back to asyncio there
+        loop="auto" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+    )